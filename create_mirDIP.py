@@ -1,3 +1,5 @@
+import sys
+
 import biocypher
 from tqdm import tqdm
 
@@ -48,8 +50,14 @@ adapter.read_data()
 driver.write_nodes(adapter.get_nodes())
 
 batches = adapter.get_edge_batches()
-for batch in tqdm(batches):
-    driver.write_edges(adapter.get_edges(batch=batch))
+with tqdm(
+    unit=" edges",
+    mininterval=1.0,
+    disable=not sys.stderr.isatty(),
+) as pbar:
+    for batch in batches:
+        driver.write_edges(adapter.get_edges(batch=batch))
+        pbar.update(batch.height)
 
 # Write admin import statement
 driver.write_import_call()
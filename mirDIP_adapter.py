@@ -1,15 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum, auto
-import hashlib
-from itertools import chain
+import functools
+from itertools import chain, repeat
+import logging
 import pickle
 import polars as pl
 import os
+import sys
 from pypath.utils import mapping
 from tqdm import tqdm
 from biocypher._logger import logger
 
 logger.debug(f"Loading module {__name__}.")
 
+NCBI_TAX_ID = 9606
+MAPPING_CACHE_PATH = os.path.join("data", "genesymbol_to_uniprot_cache.pickle")
+# pypath lookups hold the GIL; threads only overlap the occasional I/O of
+# loading further mapping tables, so a few workers suffice
+MAPPING_WORKERS = min(8, os.cpu_count() or 1)
+PICKLE_BUFFER_SIZE = 1 << 22
+
+map_genesymbol_to_uniprot = functools.partial(
+    mapping.map_name, id_type="genesymbol", target_id_type="uniprot"
+)
+
 
 class mirDIPAdapterNodeType(Enum):
     """
@@ -46,6 +60,30 @@ class mirDIPAdapterMirnaGeneEdgeField(Enum):
     GENE_UNIPROT_ID = auto()  # mapping though pypath
 
 
+# dtypes of the mirDIP columns, by field; set explicitly when parsing the
+# text file instead of inferring them
+MIRDIP_DTYPES = {
+    mirDIPAdapterMirnaGeneEdgeField.GENE_SYMBOL: pl.Utf8,
+    mirDIPAdapterMirnaGeneEdgeField.MICRORNA: pl.Utf8,
+    mirDIPAdapterMirnaGeneEdgeField.RANK: pl.Float64,
+    mirDIPAdapterMirnaGeneEdgeField.SCORE: pl.Float64,
+    mirDIPAdapterMirnaGeneEdgeField.SOURCE: pl.Utf8,
+    mirDIPAdapterMirnaGeneEdgeField.ORIGINAL_SOURCE_GENE_SYMBOL: pl.Utf8,
+    mirDIPAdapterMirnaGeneEdgeField.ORIGINAL_SOURCE_MICRORNA: pl.Utf8,
+    mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS: pl.Utf8,
+}
+
+# fields read from the mirDIP data for edge generation, in column order
+EDGE_DATA_FIELDS = (
+    mirDIPAdapterMirnaGeneEdgeField.GENE_SYMBOL,
+    mirDIPAdapterMirnaGeneEdgeField.MICRORNA,
+    mirDIPAdapterMirnaGeneEdgeField.RANK,
+    mirDIPAdapterMirnaGeneEdgeField.SCORE,
+    mirDIPAdapterMirnaGeneEdgeField.SOURCE,
+    mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS,
+)
+
+
 class mirDIPAdapter:
     """
     BioCypher adapter for mirDIP. Generates miRNA and protein nodes and
@@ -55,6 +93,31 @@ class mirDIPAdapter:
         fields (list): List of fields to include in the node.
     """
 
+    __slots__ = (
+        "node_types",
+        "edge_types",
+        "edge_fields",
+        "data_source",
+        "data_version",
+        "data_licence",
+        "test_mode",
+        "clear_cache",
+        "columns",
+        "symbol_to_uniprot",
+        "unmapped_gene_symbols",
+        "_base_node_props",
+        "_base_edge_props",
+        "_want_rank",
+        "_want_score",
+        "_want_score_class",
+        "_source",
+        "_text_path",
+        "_n_rows",
+        "_from_parquet",
+        "_unique_mirs",
+        "_mapping_cache",
+    )
+
     def __init__(
         self,
         node_types: str = None,
@@ -69,6 +132,17 @@ class mirDIPAdapter:
         self.data_version = "5.2"
         self.data_licence = "free to use, copy, and modify for academic and non-commercial purposes"
 
+        # static node and edge properties, copied for each node and edge
+        self._base_node_props = {
+            "source": self.data_source,
+            "version": self.data_version,
+            "licence": self.data_licence,
+        }
+        self._base_edge_props = {
+            "version": f"{self.data_source} version {self.data_version}",
+            "licence": self.data_licence,
+        }
+
         self.test_mode = test_mode
         self.clear_cache = clear_cache
 
@@ -84,88 +158,131 @@ class mirDIPAdapter:
 
             for gene_symbol, uniprots in self.symbol_to_uniprot.items():
 
-                props = {
-                    "gene_symbol": gene_symbol,
-                    "source": self.data_source,
-                    "version": self.data_version,
-                    "licence": self.data_licence,
-                }
+                props = {"gene_symbol": gene_symbol, **self._base_node_props}
 
                 for id in uniprots:
                     yield (f"uniprot:{id}", "protein", props)
 
-            print(self.unmapped_gene_symbols)
-            print(len(self.unmapped_gene_symbols))
+            logger.info(
+                "Unmapped gene symbols: %d", len(self.unmapped_gene_symbols)
+            )
+
+            # only format the full set if it is going to be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Unmapped gene symbols: %s",
+                    sorted(self.unmapped_gene_symbols),
+                )
 
         if mirDIPAdapterNodeType.MICRORNA in self.node_types:
 
             logger.debug("Generating miRNA nodes.")
 
-            mirs = set(self.data.get_column("MICRORNA").to_list())
+            for mir in self._unique_mirs:
 
-            for mir in mirs:
-
-                props = {
-                    "source": self.data_source,
-                    "version": self.data_version,
-                    "licence": self.data_licence,
-                }
-
-                yield (mir, "mirna", props)
+                yield (mir, "mirna", self._base_node_props.copy())
 
     def get_edges(self, batch):
         """
         Returns a generator of edge tuples for edge types specified in the
         adapter constructor.
+
+        Edge ids are 64-bit polars row hashes, as 16 hex digits, computed
+        with fixed seeds in `get_edge_batches`. They are stable across runs
+        with the same polars version, but may change with it.
+
+        Args:
+            batch (pl.DataFrame): Batch of edge data, as returned by
+                `get_edge_batches`.
         """
 
         logger.debug("Generating miRNA-gene edges.")
 
-        for row in batch.iter_rows():
-            gene_symbol = row[mirDIPAdapterMirnaGeneEdgeField.GENE_SYMBOL.value]
-            mir_name = row[mirDIPAdapterMirnaGeneEdgeField.MICRORNA.value]
-
-            label = (
-                "mirna_protein_interaction_"
-                + row[mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS.value]
+        score_class_column = self.columns[
+            mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS.value
+        ]
+
+        # edge labels by score class, built once per batch instead of
+        # concatenated per row
+        labels = {
+            score_class: f"mirna_protein_interaction_{score_class}"
+            for score_class in batch.get_column(score_class_column)
+            .unique()
+            .to_list()
+        }
+
+        base_props = self._base_edge_props
+        want_rank = self._want_rank
+        want_score = self._want_score
+        want_score_class = self._want_score_class
+
+        def to_list(field):
+            return batch.get_column(self.columns[field.value]).to_list()
+
+        # extract the needed columns of the batch once and zip over the
+        # resulting lists instead of materialising every row through polars;
+        # optional fields that are not requested are not converted at all
+        columns = (
+            batch.get_column("EDGE_ID").to_list(),
+            to_list(mirDIPAdapterMirnaGeneEdgeField.MICRORNA),
+            batch.get_column("UNIPROT").to_list(),
+            to_list(mirDIPAdapterMirnaGeneEdgeField.SOURCE),
+            (
+                to_list(mirDIPAdapterMirnaGeneEdgeField.RANK)
+                if want_rank
+                else repeat(None)
+            ),
+            (
+                to_list(mirDIPAdapterMirnaGeneEdgeField.SCORE)
+                if want_score
+                else repeat(None)
+            ),
+            to_list(mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS),
+        )
+
+        for (
+            row_id,
+            mir_name,
+            uniprot,
+            source,
+            rank,
+            score,
+            score_class,
+        ) in zip(*columns):
+
+            props = {**base_props, "source": source}
+
+            if want_rank:
+                props["rank"] = rank
+
+            if want_score:
+                props["score"] = score
+
+            if want_score_class:
+                props["score_class"] = score_class
+
+            yield (
+                f"{row_id:016x}",
+                mir_name,
+                uniprot,
+                labels[score_class],
+                props,
             )
 
-            props = {
-                "source": row[mirDIPAdapterMirnaGeneEdgeField.SOURCE.value],
-                "version": f"{self.data_source} version {self.data_version}",
-                "licence": self.data_licence,
-            }
-
-            if mirDIPAdapterMirnaGeneEdgeField.RANK in self.edge_fields:
-                props["rank"] = row[mirDIPAdapterMirnaGeneEdgeField.RANK.value]
-
-            if mirDIPAdapterMirnaGeneEdgeField.SCORE in self.edge_fields:
-                props["score"] = row[
-                    mirDIPAdapterMirnaGeneEdgeField.SCORE.value
-                ]
-
-            if mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS in self.edge_fields:
-                props["score_class"] = row[
-                    mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS.value
-                ]
-
-            uniprots = self.symbol_to_uniprot.get(gene_symbol, [])
-
-            # create md5 hash of row to use as edge id
-            _id = hashlib.md5(str(row).encode()).hexdigest()
+    def get_edge_batches(self, batch_size: int = 200_000):
+        """
+        Returns a generator of edge data batches to pass to `get_edges` one
+        at a time, with the uniprot ids of each gene symbol joined on. Only
+        one batch of the data is joined and held in memory at a time.
 
-            for uniprot in uniprots:
+        Args:
+            batch_size (int): Number of rows per batch.
+        """
 
-                yield (
-                    _id,
-                    mir_name,
-                    f"uniprot:{uniprot}",
-                    label,
-                    props,
-                )
+        map_df = self._uniprot_map_frame()
 
-    def get_edge_batches(self, batch_size: int = int(1e6)):
-        return self.data.iter_slices(n_rows=batch_size)
+        for batch in self._read_edge_batches(batch_size):
+            yield self._join_uniprot_ids(batch, map_df)
 
     def _set_types_and_fields(self, node_types, edge_types, edge_fields):
         if node_types:
@@ -179,11 +296,20 @@ class mirDIPAdapter:
             self.edge_types = [type for type in mirDIPAdapterEdgeType]
 
         if edge_fields:
-            self.edge_fields = edge_fields
+            self.edge_fields = frozenset(edge_fields)
         else:
-            self.edge_fields = [
-                field for field in mirDIPAdapterMirnaGeneEdgeField
-            ]
+            self.edge_fields = frozenset(mirDIPAdapterMirnaGeneEdgeField)
+
+        # optional edge properties, resolved once instead of per edge
+        self._want_rank = (
+            mirDIPAdapterMirnaGeneEdgeField.RANK in self.edge_fields
+        )
+        self._want_score = (
+            mirDIPAdapterMirnaGeneEdgeField.SCORE in self.edge_fields
+        )
+        self._want_score_class = (
+            mirDIPAdapterMirnaGeneEdgeField.SCORE_CLASS in self.edge_fields
+        )
 
     def read_data(self):
         """
@@ -194,117 +320,362 @@ class mirDIPAdapter:
 
         path = os.path.join("data", "mirDIP_Bidirectional_search_v_5_2")
 
-        # column names: load README.txt using polars
+        # column names: load README.txt
         # each column name is on a separate line, skip the first line
-        self.columns = pl.read_csv(os.path.join(path, "README.txt"))
+        with open(os.path.join(path, "README.txt")) as f:
+            self.columns = [
+                line.strip() for line in f.read().splitlines()[1:]
+            ]
 
-        # first column to list
-        self.columns = self.columns[
-            "Columns for file: mirDIP_Bidirectional_search_v.5.txt"
-        ].to_list()
+        self.columns = [column for column in self.columns if column]
+
+        # used to read edges batch-wise from the text file
+        self._text_path = os.path.join(
+            path, "mirDIP_Bidirectional_search_v.5.txt"
+        )
+        self._n_rows = 20_000_000 if self.test_mode else None
+
+        parquet_path = os.path.join(
+            path, "mirDIP_Bidirectional_search_v.5.utf8.parquet"
+        )
+
+        # the parquet cache is independent of clear_cache, which concerns the
+        # pypath mapping; it is rebuilt when the text file is newer
+        cache_is_fresh = os.path.exists(parquet_path) and (
+            not os.path.exists(self._text_path)
+            or os.path.getmtime(parquet_path)
+            >= os.path.getmtime(self._text_path)
+        )
+
+        # in test mode, the cache is used if present but never written
+        self._from_parquet = cache_is_fresh or not self.test_mode
+
+        if self._from_parquet and not cache_is_fresh:
+            self._write_parquet_cache(parquet_path)
+
+        # scan data lazily, so that only the columns needed for nodes are
+        # read here; edge data is read batch-wise in get_edge_batches
+        self._source = self._scan_source(parquet_path)
+
+        # show dataframe description of the edge columns, from either
+        # source; this aggregates every column, so only compute it if it is
+        # logged, which full runs only do when debugging
+        describe_level = logging.INFO if self.test_mode else logging.DEBUG
+
+        if logger.isEnabledFor(describe_level):
+            logger.log(
+                describe_level,
+                "mirDIP dataframe description:\n%s",
+                self._source.select(
+                    [self.columns[field.value] for field in EDGE_DATA_FIELDS]
+                )
+                .collect(streaming=True)
+                .describe(),
+            )
 
-        # read data from mirDIP_Bidirectional_search_v.5.txt, using columns as
-        # column names
-        if not self.test_mode:
+        # nodes and gene symbol mapping only need the unique gene symbols,
+        # with their first original symbol in the file, and miRNAs;
+        # deduplicate them separately, as almost every row is a different
+        # gene-miRNA pair; collect_all runs both queries in parallel, but
+        # each scans its columns of the source on its own
+        symbol_pairs, mirs = pl.collect_all(
+            [
+                self._source.select(
+                    ["GENE_SYMBOL", "GENE_SYMBOL_ORI"]
+                ).unique(
+                    subset="GENE_SYMBOL", keep="first", maintain_order=True
+                ),
+                self._source.select(["MICRORNA"]).unique(),
+            ]
+        )
 
-            self.data = pl.read_csv(
-                os.path.join(path, "mirDIP_Bidirectional_search_v.5.txt"),
-                has_header=False,
-                new_columns=self.columns,
-            )
+        self._unique_mirs = mirs.get_column("MICRORNA").to_list()
 
-        else:
+        self._translate_gene_symbols(symbol_pairs)
 
-            self.data = pl.read_csv(
-                os.path.join(path, "mirDIP_Bidirectional_search_v.5.txt"),
-                has_header=False,
-                new_columns=self.columns,
-                n_rows=20_000_000,
-            )
+    def _read_edge_batches(self, batch_size):
+        """
+        Read the edge columns of the mirDIP data in batches. The text file
+        is read with polars' batched CSV reader, so that it is never held in
+        memory as a whole. polars has no batched parquet reader, so from the
+        parquet cache, the edge columns are collected once and sliced.
+        """
 
-        # show dataframe description
-        logger.info("Printing mirDIP dataframe description.")
-        print(self.data.describe())
+        edge_columns = [
+            self.columns[field.value] for field in EDGE_DATA_FIELDS
+        ]
 
-        # # show data where GENE_SYMBOL and GENE_SYMBOL_ORI are not the same
-        # print(
-        #     self.data.filter(pl.col("GENE_SYMBOL") != pl.col("GENE_SYMBOL_ORI"))
-        # )
+        if self._from_parquet:
 
-        # # show data where MICRORNA and MICRORNA_ORI are not the same
-        # print(self.data.filter(pl.col("MICRORNA") != pl.col("MICRORNA_ORI")))
+            # polars 0.16 only pushes a slice at offset 0 into a parquet
+            # scan, so slicing the scan per batch would re-read the file for
+            # each batch; collect the edge columns once and slice them
+            data = self._source.select(edge_columns).collect(streaming=True)
 
-        self._translate_gene_symbols()
+            yield from data.iter_slices(n_rows=batch_size)
 
-    def _translate_gene_symbols(self):
+            return
+
+        # only parse the edge columns; polars 0.16 cannot combine a column
+        # projection with dtypes in the batched reader, so read them as Utf8
+        # and cast them to their dtypes per batch
+        reader = pl.read_csv_batched(
+            self._text_path,
+            has_header=False,
+            columns=[field.value for field in EDGE_DATA_FIELDS],
+            new_columns=edge_columns,
+            infer_schema_length=0,
+            low_memory=False,
+            n_rows=self._n_rows,
+            batch_size=batch_size,
+        )
+
+        casts = [
+            pl.col(self.columns[field.value]).cast(MIRDIP_DTYPES[field])
+            for field in EDGE_DATA_FIELDS
+            if MIRDIP_DTYPES[field] != pl.Utf8
+        ]
+
+        while batches := reader.next_batches(1):
+            yield batches[0].with_columns(casts)
+
+    def _scan_source(self, parquet_path):
         """
-        Translate gene symbols to uniprot ids using pypath.
+        Scan the mirDIP data lazily, from the parquet cache if it is used,
+        or from the text file otherwise.
         """
 
-        # load from pickle if available
-        if (
-            os.path.exists("data/symbol_to_uniprot.pickle")
-            and not self.clear_cache
-        ):
+        if self._from_parquet:
+            logger.info("Scanning mirDIP data from parquet cache.")
 
-            logger.info("Loading symbol_to_uniprot from pickle.")
+            return pl.scan_parquet(parquet_path, n_rows=self._n_rows)
 
-            with open("data/symbol_to_uniprot.pickle", "rb") as f:
-                self.symbol_to_uniprot = pickle.load(f)
+        return self._scan_text()
 
-            with open("data/unmapped_gene_symbols.pickle", "rb") as f:
-                self.unmapped_gene_symbols = pickle.load(f)
+    def _scan_text(self):
+        """
+        Scan the mirDIP text file lazily.
+        """
 
-            return
+        # scan data from mirDIP_Bidirectional_search_v.5.txt with explicit
+        # dtypes for the known fields, using columns as column names; dtypes
+        # refer to polars' default names of headerless columns
+        return pl.scan_csv(
+            self._text_path,
+            has_header=False,
+            dtypes={
+                f"column_{field.value + 1}": dtype
+                for field, dtype in MIRDIP_DTYPES.items()
+            },
+            low_memory=False,
+            n_rows=self._n_rows,
+        ).rename(
+            {
+                f"column_{index + 1}": column
+                for index, column in enumerate(self.columns)
+            }
+        )
 
-        # else use pypath
-        logger.info("Translating gene symbols to uniprot ids using pypath.")
+    def _write_parquet_cache(self, parquet_path):
+        """
+        Parse the mirDIP text file once and cache it as a parquet file next
+        to it, which is scanned on subsequent runs until the text file
+        changes.
+        """
 
-        self.unmapped_gene_symbols = set()
-        self.symbol_to_uniprot = {}
+        logger.info("Caching mirDIP data as parquet.")
+
+        # only the columns needed for nodes and edges are cached; string
+        # columns stay Utf8, as polars cannot concatenate categoricals read
+        # from separate row groups, and parquet dictionary-encodes the
+        # repetitive ones anyway
+        # write to a temporary file first, so that an interrupted write does
+        # not leave a truncated cache that looks fresh
+        tmp_path = f"{parquet_path}.tmp"
+
+        self._scan_text().select(
+            [self.columns[field.value] for field in EDGE_DATA_FIELDS]
+            + ["GENE_SYMBOL_ORI"]
+        ).sink_parquet(
+            tmp_path,
+            compression="zstd",
+            statistics=True,
+            row_group_size=1_000_000,
+        )
+
+        os.replace(tmp_path, parquet_path)
+
+    def _uniprot_map_frame(self):
+        """
+        Build a frame of the prefixed uniprot ids of each mapped gene symbol,
+        to join onto the edge data.
+        """
 
-        gene_symbols = set(self.data.get_column("GENE_SYMBOL").to_list())
+        return pl.DataFrame(
+            {
+                "GENE_SYMBOL": list(self.symbol_to_uniprot.keys()),
+                "UNIPROT": [
+                    [f"uniprot:{uniprot}" for uniprot in uniprots]
+                    for uniprots in self.symbol_to_uniprot.values()
+                ],
+            },
+            # explicit, as the dtypes cannot be inferred if nothing mapped
+            schema={"GENE_SYMBOL": pl.Utf8, "UNIPROT": pl.List(pl.Utf8)},
+        )
+
+    def _join_uniprot_ids(self, batch, map_df):
+        """
+        Join the uniprot ids of each gene symbol onto a batch of edge data
+        and explode them to one row per miRNA-protein pair, with an edge id
+        column. Rows of unmapped gene symbols are dropped.
+        """
 
-        for gene_symbol in tqdm(gene_symbols):
+        edges = batch.join(map_df, on="GENE_SYMBOL", how="inner").explode(
+            "UNIPROT"
+        )
 
-            # get ensg id from pypath
-            uniprot_id = mapping.map_name(
-                name=gene_symbol,
-                id_type="genesymbol",
-                target_id_type="uniprot",
-                ncbi_tax_id=9606,
-            )
+        # hash the exploded rows in polars once per batch to use as edge
+        # ids; the seeds are fixed, so that ids are the same across runs
+        return edges.hstack(
+            [
+                edges.hash_rows(seed=0, seed_1=1, seed_2=2, seed_3=3).alias(
+                    "EDGE_ID"
+                )
+            ]
+        )
 
-            if not uniprot_id:
+    def _translate_gene_symbols(self, symbol_pairs):
+        """
+        Translate gene symbols to uniprot ids using pypath.
 
-                # get original gene symbol from self.data
-                original_gene_symbol = (
-                    self.data.filter(pl.col("GENE_SYMBOL") == gene_symbol)
-                    .get_column("GENE_SYMBOL_ORI")
-                    .to_list()[0]
-                )
+        Args:
+            symbol_pairs (pl.DataFrame): Unique GENE_SYMBOL values with the
+                first GENE_SYMBOL_ORI they occur with in the data.
+        """
+
+        # map each gene symbol to its original symbol in a single pass over
+        # the data instead of filtering the data frame once per symbol
+        ori_map = dict(symbol_pairs.drop_nulls("GENE_SYMBOL").iter_rows())
+        gene_symbols = list(ori_map.keys())
 
-                if original_gene_symbol == gene_symbol:
-                    self.unmapped_gene_symbols.add(gene_symbol)
-                    continue
+        # pypath lookups are memoised per symbol in the mapping cache, so
+        # repeated runs do not call pypath again
+        logger.info("Translating gene symbols to uniprot ids using pypath.")
 
-                uniprot_id = mapping.map_name(
-                    name=original_gene_symbol,
-                    id_type="genesymbol",
-                    target_id_type="uniprot",
-                    ncbi_tax_id=9606,
+        self.unmapped_gene_symbols = set()
+        self.symbol_to_uniprot = {}
+
+        self._load_mapping_cache()
+
+        # pypath loads its mapping tables lazily on the first lookup, which
+        # is not thread-safe; load them on the main thread before the pool,
+        # with a symbol that is not answered from the mapping cache
+        uncached_symbol = next(
+            (
+                gene_symbol
+                for gene_symbol in gene_symbols
+                if (gene_symbol, NCBI_TAX_ID) not in self._mapping_cache
+            ),
+            None,
+        )
+
+        if uncached_symbol is not None:
+            self._map_symbol(uncached_symbol)
+
+        with ThreadPoolExecutor(max_workers=MAPPING_WORKERS) as executor:
+            results = list(
+                tqdm(
+                    executor.map(
+                        self._map_one, gene_symbols, ori_map.values()
+                    ),
+                    total=len(gene_symbols),
+                    mininterval=1.0,
+                    disable=not sys.stderr.isatty(),
                 )
+            )
+
+        for gene_symbol, uniprot_id in results:
 
             if not uniprot_id:
                 self.unmapped_gene_symbols.add(gene_symbol)
                 continue
 
-            self.symbol_to_uniprot[gene_symbol] = uniprot_id
+            # interned symbols and sorted tuples of ids keep the mapping
+            # compact and its order deterministic
+            self.symbol_to_uniprot[sys.intern(gene_symbol)] = tuple(
+                sorted(uniprot_id)
+            )
+
+        self._save_mapping_cache()
+
+    def _map_one(self, gene_symbol, original_gene_symbol):
+        """
+        Map a gene symbol to uniprot ids, falling back to the original gene
+        symbol from mirDIP if the symbol itself cannot be mapped.
+
+        Returns:
+            tuple: The gene symbol and its uniprot ids (empty if unmapped).
+        """
+
+        # get uniprot id from pypath
+        uniprot_id = self._map_symbol(gene_symbol)
+
+        if not uniprot_id:
+
+            if original_gene_symbol and original_gene_symbol != gene_symbol:
+                uniprot_id = self._map_symbol(original_gene_symbol)
+
+        return gene_symbol, uniprot_id
+
+    def _map_symbol(self, gene_symbol, ncbi_tax_id=NCBI_TAX_ID):
+        """
+        Map a gene symbol to uniprot ids using pypath, memoised per
+        (symbol, taxon) in the mapping cache.
+        """
+
+        key = (gene_symbol, ncbi_tax_id)
+
+        if key not in self._mapping_cache:
+            self._mapping_cache[key] = map_genesymbol_to_uniprot(
+                name=gene_symbol, ncbi_tax_id=ncbi_tax_id
+            )
 
-        # pickle to file in data/
-        with open("data/symbol_to_uniprot.pickle", "wb") as f:
-            pickle.dump(self.symbol_to_uniprot, f)
+        return self._mapping_cache[key]
 
-        # pickle unmapped gene symbols to file in data/
-        with open("data/unmapped_gene_symbols.pickle", "wb") as f:
-            pickle.dump(self.unmapped_gene_symbols, f)
+    def _load_mapping_cache(self):
+        """
+        Load the per-symbol pypath mapping cache from disk, or start an empty
+        one. If `clear_cache` is set, the cache file is removed first.
+        """
+
+        if self.clear_cache and os.path.exists(MAPPING_CACHE_PATH):
+            logger.info("Removing pypath mapping cache.")
+            os.remove(MAPPING_CACHE_PATH)
+
+        if os.path.exists(MAPPING_CACHE_PATH):
+            logger.info("Loading pypath mapping cache from pickle.")
+
+            with open(
+                MAPPING_CACHE_PATH, "rb", buffering=PICKLE_BUFFER_SIZE
+            ) as f:
+                keys, values = pickle.load(f)
+
+            self._mapping_cache = dict(zip(keys, values))
+
+        else:
+            self._mapping_cache = {}
+
+    def _save_mapping_cache(self):
+        """
+        Pickle the per-symbol pypath mapping cache to disk.
+        """
+
+        with open(MAPPING_CACHE_PATH, "wb", buffering=PICKLE_BUFFER_SIZE) as f:
+            pickle.dump(
+                (
+                    list(self._mapping_cache.keys()),
+                    list(self._mapping_cache.values()),
+                ),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )